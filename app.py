@@ -4,8 +4,12 @@
 # Run:  streamlit run app.py
 # ══════════════════════════════════════════════════════════════════════════════
 
+import io
+import logging
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Ensure project root is on the path
@@ -15,13 +19,24 @@ sys.path.insert(0, str(PROJECT_ROOT))
 import streamlit as st
 
 from config.settings import REPORTS_DIR, DATA_DIR
-from src.ingestion.ais_stream import get_ais_data
-from src.ingestion.sar_fetch import fetch_sar_image
-from src.ai_models.detector import detect_vessels, fallback_detections, VISION_MODELS
-from src.ai_models.fusion import find_dark_vessels
-from src.forensics.hasher import hash_evidence
-from src.forensics.timestamp import get_ist_timestamp
-from src.reporting.pdf_gen import generate_report
+from src.ingestion.sar_fetch import fetch_sar_image, _parse_filename
+from src.ai_models.detector import VISION_MODELS
+from src.ai_models._client_cache import warm_client
+from src.forensics.timestamp import warm_clock
+
+# ── Logging ──────────────────────────────────────────────────────────────────
+# Pipeline modules log their progress under the "src" package logger.
+# Set GMIE_LOG_LEVEL=WARNING to silence it for unattended runs.
+_pipeline_log = logging.getLogger("src")
+if not _pipeline_log.handlers:  # app.py is re-executed on every rerun
+    _level = os.getenv("GMIE_LOG_LEVEL", "INFO").upper()
+    _valid_level = isinstance(logging.getLevelName(_level), int)
+    _pipeline_log.setLevel(_level if _valid_level else "INFO")
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _pipeline_log.addHandler(_handler)
+    if not _valid_level:
+        _pipeline_log.warning("GMIE_LOG_LEVEL=%s is not a log level name, using INFO.", _level)
 
 # ── Page config ──────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -32,157 +47,91 @@ st.set_page_config(
 )
 
 # ── Custom CSS ───────────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
+@st.cache_resource
+def _load_css() -> str:
+    """Read the dashboard stylesheet once per server process."""
+    return (PROJECT_ROOT / "static" / "gmie.css").read_text(encoding="utf-8")
 
-    /* Global font */
-    html, body, [class*="st-"] {
-        font-family: 'Inter', sans-serif;
-    }
 
-    /* Dark gradient header */
-    .main-header {
-        background: linear-gradient(135deg, #0f0c29 0%, #302b63 50%, #24243e 100%);
-        padding: 2rem 2.5rem;
-        border-radius: 16px;
-        margin-bottom: 2rem;
-        border: 1px solid rgba(255,255,255,0.08);
-        box-shadow: 0 8px 32px rgba(0,0,0,0.4);
-    }
-    .main-header h1 {
-        color: #ffffff;
-        font-size: 2rem;
-        font-weight: 800;
-        margin: 0;
-        letter-spacing: -0.5px;
-    }
-    .main-header p {
-        color: #a0aec0;
-        font-size: 1rem;
-        margin: 0.4rem 0 0 0;
-    }
-
-    /* Step cards */
-    .step-card {
-        background: linear-gradient(145deg, #1a1a2e 0%, #16213e 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        margin: 1rem 0;
-        border-left: 4px solid #e94560;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.3);
-    }
-    .step-card h3 {
-        color: #e94560;
-        font-size: 1.1rem;
-        font-weight: 700;
-        margin: 0 0 0.5rem 0;
-    }
-    .step-card p {
-        color: #cbd5e0;
-        margin: 0;
-        font-size: 0.9rem;
-    }
-
-    /* Alert banner */
-    .dark-vessel-alert {
-        background: linear-gradient(135deg, #b91c1c 0%, #dc2626 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-        margin: 1.5rem 0;
-        animation: pulse-glow 2s ease-in-out infinite alternate;
-    }
-    .dark-vessel-alert h2 {
-        color: white;
-        margin: 0;
-        font-size: 1.4rem;
-        font-weight: 800;
-    }
-    .dark-vessel-alert p {
-        color: #fecaca;
-        margin: 0.3rem 0 0 0;
-    }
-
-    @keyframes pulse-glow {
-        from { box-shadow: 0 0 10px rgba(220,38,38,0.4); }
-        to   { box-shadow: 0 0 25px rgba(220,38,38,0.8); }
-    }
-
-    /* Stat cards */
-    .stat-card {
-        background: linear-gradient(145deg, #1e293b 0%, #0f172a 100%);
-        padding: 1.2rem;
-        border-radius: 12px;
-        text-align: center;
-        border: 1px solid rgba(255,255,255,0.06);
-    }
-    .stat-card .stat-value {
-        font-size: 2rem;
-        font-weight: 800;
-        color: #60a5fa;
-    }
-    .stat-card .stat-label {
-        font-size: 0.78rem;
-        color: #94a3b8;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-
-    /* Sidebar styling */
-    section[data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0f0c29 0%, #1a1a2e 100%);
-    }
-    section[data-testid="stSidebar"] .stMarkdown h1,
-    section[data-testid="stSidebar"] .stMarkdown h2,
-    section[data-testid="stSidebar"] .stMarkdown h3 {
-        color: #e2e8f0;
-    }
-    section[data-testid="stSidebar"] .stMarkdown p,
-    section[data-testid="stSidebar"] .stMarkdown li {
-        color: #94a3b8;
-    }
+st.markdown(
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    f"<style>{_load_css()}</style>",
+    unsafe_allow_html=True,
+)
 
-    /* Vessel table */
-    .vessel-row {
-        background: rgba(15, 23, 42, 0.6);
-        padding: 0.8rem 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border-left: 3px solid #f59e0b;
-    }
-    .vessel-row.dark {
-        border-left: 3px solid #ef4444;
-        background: rgba(127, 29, 29, 0.2);
-    }
 
-    /* Hide streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-
-    /* Fix expander overlap */
-    .streamlit-expanderHeader, 
-    [data-testid="stExpander"] summary {
-        position: relative;
-        z-index: 1;
-        padding: 0.75rem 1rem;
-        font-size: 1rem;
-        font-weight: 600;
-        line-height: 1.5;
-        overflow: visible;
-    }
-    [data-testid="stExpander"] summary span {
-        display: inline;
-        white-space: normal;
-        overflow: visible;
-        text-overflow: unset;
+# ── Pipeline helpers ─────────────────────────────────────────────────────────
+# Fixed table layouts — building frames from known columns skips pandas'
+# per-record key discovery and keeps the column order stable
+_AIS_COLUMNS = ["ship_id", "latitude", "longitude", "date", "time"]
+_DETECTION_COLUMNS = [
+    "vessel_id", "vessel_type", "estimated_length_m",
+    "estimated_width_m", "confidence", "relative_position",
+]
+_DARK_VESSEL_COLUMNS = {
+    "radar_id": "Radar ID",
+    "vessel_type": "Type",
+    "estimated_length_m": "Length (m)",
+    "estimated_width_m": "Width (m)",
+    "confidence": "Confidence",
+    "ais_status": "AIS Status",
+}
+
+# Gallery previews only — the pipeline always works on the full-res image
+_THUMB_SIZE = (512, 512)
+
+
+@st.cache_resource
+def _executor() -> ThreadPoolExecutor:
+    """Shared worker pool used to overlap independent pipeline I/O."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="gmie")
+
+
+@st.cache_data(show_spinner=False)
+def _list_sar_images(mtime_ns: int) -> list[Path]:
+    """
+    List the SAR images in data/, cached across reruns.
+
+    `mtime_ns` is the directory's mtime and only serves as the cache key —
+    adding or removing a file changes it and forces a fresh listing.
+    """
+    return sorted(DATA_DIR.glob("*.jpeg"))
+
+
+@st.cache_data(show_spinner=False)
+def _thumbnail(image_path: str, mtime_ns: int) -> bytes:
+    """Encode a downscaled WebP preview of a SAR image for the gallery."""
+    from PIL import Image
+
+    with Image.open(image_path) as im:
+        im.thumbnail(_THUMB_SIZE)
+        buf = io.BytesIO()
+        im.save(buf, "WEBP", quality=75)
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def _load_sar(image_path: str, mtime_ns: int) -> tuple[bytes, dict]:
+    """
+    Read a SAR image and build its metadata, cached across reruns.
+
+    `mtime_ns` is only part of the cache key, so an edited file is re-read.
+    """
+    img_path = Path(image_path)
+    meta = _parse_filename(img_path.name)
+    return img_path.read_bytes(), {
+        "image_path": str(img_path),
+        "image_name": img_path.name,
+        "latitude": meta["latitude"],
+        "longitude": meta["longitude"],
+        "lat_direction": meta["lat_direction"],
+        "lon_direction": meta["lon_direction"],
+        "date": meta["date"],
+        "image_id": f"S1-{img_path.stem.replace('.', '').replace('_', '-')}",
+        # The bytes were just read, so report generation can skip its check
+        "image_path_validated": True,
     }
-    [data-testid="stExpander"] {
-        overflow: visible;
-    }
-</style>
-""", unsafe_allow_html=True)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -221,7 +170,7 @@ with st.sidebar:
 
     # Image selector
     st.markdown("### 🛰️ SAR Image")
-    available_images = sorted(DATA_DIR.glob("*.jpeg"))
+    available_images = _list_sar_images(DATA_DIR.stat().st_mtime_ns)
     image_names = [img.name for img in available_images]
 
     image_mode = st.radio(
@@ -246,6 +195,20 @@ with st.sidebar:
     )
 
 
+# ── Background warm-up ───────────────────────────────────────────────────────
+# Once a key is entered, build its Gemini client and open the connection in
+# the background so Step 2 doesn't pay the SDK import and TLS handshake.
+# The NTP clock offset is fetched the same way once per session, so sealing
+# evidence doesn't wait on the network. Set GMIE_NO_WARMUP=1 to disable.
+if not os.getenv("GMIE_NO_WARMUP"):
+    if api_key and st.session_state.get("warmed_key") != api_key:
+        st.session_state.warmed_key = api_key
+        _executor().submit(warm_client, api_key, selected_model)
+    if not st.session_state.get("warmed_clock"):
+        st.session_state.warmed_clock = True
+        _executor().submit(warm_clock)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # MAIN AREA — Header
 # ══════════════════════════════════════════════════════════════════════════════
@@ -272,7 +235,26 @@ with col_info:
 # ══════════════════════════════════════════════════════════════════════════════
 # PIPELINE EXECUTION
 # ══════════════════════════════════════════════════════════════════════════════
+# Step results are kept in session_state, so reruns triggered by other widgets
+# redraw the last run instead of repeating the Gemini call, hashing, timestamp
+# and report generation. Only the launch button starts a fresh run.
 if run_pipeline:
+    st.session_state.pipeline = {}
+
+if "pipeline" in st.session_state:
+    # Pipeline-only modules pull in pandas, numpy and requests — load them
+    # on first run instead of on every page render
+    import pandas as pd
+
+    from src.ingestion.ais_stream import get_ais_data
+    from src.ai_models.detector import detect_vessels, fallback_detections
+    from src.ai_models.fusion import find_dark_vessels
+    from src.forensics.hasher import hash_evidence, hash_image
+    from src.forensics.timestamp import get_ist_timestamp
+    from src.reporting.pdf_gen import generate_report
+
+    state = st.session_state.pipeline
+
     st.markdown("---")
 
     # ━━━━━━━ STEP 1: Evidence Collection ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -281,31 +263,24 @@ if run_pipeline:
         <p>Fetching SAR satellite image and AIS ship signals from the monitoring zone.</p>
     </div>""", unsafe_allow_html=True)
 
-    with st.spinner("📡 Fetching SAR image & AIS signals..."):
-        # SAR image
-        if selected_image_path:
-            from src.ingestion.sar_fetch import _parse_filename
-            img_path = Path(selected_image_path)
-            meta = _parse_filename(img_path.name)
-            sar_metadata = {
-                "image_path": str(img_path),
-                "image_name": img_path.name,
-                "latitude": meta["latitude"],
-                "longitude": meta["longitude"],
-                "lat_direction": meta["lat_direction"],
-                "lon_direction": meta["lon_direction"],
-                "date": meta["date"],
-                "image_id": f"S1-{img_path.stem.replace('.', '').replace('_', '-')}",
-            }
-        else:
-            sar_metadata = fetch_sar_image()
+    if "ais_data" not in state:
+        with st.spinner("📡 Fetching SAR image & AIS signals..."):
+            # AIS data is independent of the SAR image — fetch it concurrently
+            ais_future = _executor().submit(get_ais_data)
+
+            sar_path = Path(selected_image_path or fetch_sar_image()["image_path"])
+            state["sar_bytes"], state["sar_metadata"] = _load_sar(
+                str(sar_path), sar_path.stat().st_mtime_ns,
+            )
+            state["ais_data"] = ais_future.result()
 
-        # AIS data
-        ais_data = get_ais_data()
+    sar_bytes = state["sar_bytes"]
+    sar_metadata = state["sar_metadata"]
+    ais_data = state["ais_data"]
 
     col1, col2 = st.columns(2)
     with col1:
-        st.image(sar_metadata["image_path"], caption=f"SAR Image: {sar_metadata['image_name']}", width="stretch")
+        st.image(sar_bytes, caption=f"SAR Image: {sar_metadata['image_name']}", width="stretch")
     with col2:
         st.markdown("**📡 SAR Metadata**")
         st.json({
@@ -316,35 +291,45 @@ if run_pipeline:
         })
 
         st.markdown("**📻 AIS Signals**")
-        import pandas as pd
-        ais_df = pd.DataFrame(ais_data)
+        ais_df = pd.DataFrame.from_records(ais_data, columns=_AIS_COLUMNS)
         st.dataframe(ais_df, width="stretch", hide_index=True)
 
     st.success(f"✅ Stakeout complete: 1 SAR image + {len(ais_data)} AIS pings collected.")
 
+    # The image hash doesn't depend on detection — start it while Gemini runs
+    if "hash_result" not in state:
+        image_hash_future = _executor().submit(hash_image, sar_metadata["image_path"], sar_bytes)
+
     # ━━━━━━━ STEP 2: AI Detection ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     st.markdown("""<div class="step-card">
         <h3>▶ STEP 2 — AI Vessel Detection (The "Identification")</h3>
         <p>Analyzing SAR imagery with Gemini Vision AI to identify vessels.</p>
     </div>""", unsafe_allow_html=True)
 
-    with st.spinner(f"🤖 Analyzing image with {selected_model}..."):
-        try:
-            radar_detections = detect_vessels(
-                sar_metadata["image_path"],
-                api_key=api_key if api_key else None,
-                model_name=selected_model,
-            )
-            detection_source = "Gemini AI" if api_key else "Simulated (No API Key)"
-        except Exception as e:
-            st.error(f"❌ Gemini API error: {e}")
-            st.info("Falling back to simulated detections.")
-            radar_detections = fallback_detections()
-            detection_source = "Simulated (API Error)"
-
-    st.markdown(f"**Detection Source:** `{detection_source}`")
-
-    det_df = pd.DataFrame(radar_detections)
+    if "radar_detections" not in state:
+        with st.spinner(f"🤖 Analyzing image with {selected_model}..."):
+            try:
+                state["radar_detections"] = detect_vessels(
+                    sar_metadata["image_path"],
+                    api_key=api_key if api_key else None,
+                    model_name=selected_model,
+                )
+                state["detection_source"] = "Gemini AI" if api_key else "Simulated (No API Key)"
+            except Exception as e:
+                state["detection_error"] = str(e)
+                state["radar_detections"] = fallback_detections()
+                state["detection_source"] = "Simulated (API Error)"
+
+    radar_detections = state["radar_detections"]
+
+    if "detection_error" in state:
+        st.error(f"❌ Gemini API error: {state['detection_error']}")
+        st.info("Falling back to simulated detections.")
+
+    st.markdown(f"**Detection Source:** `{state['detection_source']}`")
+
+    det_df = pd.DataFrame.from_records(radar_detections, columns=_DETECTION_COLUMNS)
+    avg_conf = int(det_df["confidence"].fillna(0).mean()) if len(det_df) else 0
     st.dataframe(det_df, width="stretch", hide_index=True)
     st.success(f"✅ Detected {len(radar_detections)} vessel(s) in the SAR image.")
 
@@ -354,8 +339,14 @@ if run_pipeline:
         <p>Comparing radar detections against AIS signals to identify dark vessels.</p>
     </div>""", unsafe_allow_html=True)
 
-    with st.spinner("⚡ Running fusion analysis..."):
-        dark_vessels = find_dark_vessels(ais_data, radar_detections, sar_metadata)
+    if "dark_vessels" not in state:
+        if not radar_detections:
+            state["dark_vessels"] = []  # nothing on radar — nothing can be dark
+        else:
+            with st.spinner("⚡ Running fusion analysis..."):
+                state["dark_vessels"] = find_dark_vessels(ais_data, radar_detections, sar_metadata)
+
+    dark_vessels = state["dark_vessels"]
 
     # Show results
     if dark_vessels:
@@ -364,14 +355,10 @@ if run_pipeline:
             <p>Ships detected on radar with NO matching AIS signal — potential illegal activity.</p>
         </div>""", unsafe_allow_html=True)
 
-        dark_df = pd.DataFrame([{
-            "Radar ID": dv["radar_id"],
-            "Type": dv["vessel_type"],
-            "Length (m)": dv["estimated_length_m"],
-            "Width (m)": dv["estimated_width_m"],
-            "Confidence": f"{dv['confidence']}%",
-            "AIS Status": dv["ais_status"],
-        } for dv in dark_vessels])
+        dark_df = pd.DataFrame.from_records(
+            dark_vessels, columns=list(_DARK_VESSEL_COLUMNS),
+        ).rename(columns=_DARK_VESSEL_COLUMNS)
+        dark_df["Confidence"] = dark_df["Confidence"].astype(str) + "%"
         st.dataframe(dark_df, width="stretch", hide_index=True)
     else:
         st.success("✅ No dark vessels found — all ships are broadcasting AIS.")
@@ -382,12 +369,25 @@ if run_pipeline:
         <p>Creating an immutable SHA-256 fingerprint of all evidence.</p>
     </div>""", unsafe_allow_html=True)
 
-    with st.spinner("🔐 Hashing evidence..."):
-        hash_result = hash_evidence(
-            image_path=sar_metadata["image_path"],
-            detection_results=radar_detections,
-            dark_vessels=dark_vessels,
-        )
+    # Steps 4 and 5 don't depend on each other — hide the timestamp round
+    # trip behind the hashing work. The timestamp is submitted first, since
+    # waiting for the image hash below would otherwise delay it
+    if "hash_result" not in state:
+        with st.status("🔐 Sealing evidence (hash + IST timestamp)...") as seal_status:
+            timestamp_future = _executor().submit(get_ist_timestamp)
+            hash_future = _executor().submit(
+                hash_evidence,
+                image_path=sar_metadata["image_path"],
+                detection_results=radar_detections,
+                dark_vessels=dark_vessels,
+                image_hasher=image_hash_future.result(),
+            )
+            state["hash_result"] = hash_future.result()
+            state["timestamp_result"] = timestamp_future.result()
+            seal_status.update(label="🔐 Evidence hashed and time-sealed", state="complete")
+
+    hash_result = state["hash_result"]
+    timestamp_result = state["timestamp_result"]
 
     col_h1, col_h2, col_h3 = st.columns(3)
     with col_h1:
@@ -418,9 +418,6 @@ if run_pipeline:
         <p>Fetching verified Indian Standard Time for the evidence chain.</p>
     </div>""", unsafe_allow_html=True)
 
-    with st.spinner("⏱️ Fetching IST timestamp..."):
-        timestamp_result = get_ist_timestamp()
-
     col_t1, col_t2, col_t3 = st.columns(3)
     with col_t1:
         st.markdown(f"""<div class="stat-card">
@@ -446,15 +443,19 @@ if run_pipeline:
         <p>Creating a court-admissible Markdown incident report.</p>
     </div>""", unsafe_allow_html=True)
 
-    with st.spinner("📋 Generating forensic report..."):
-        report_path = generate_report(
-            sar_metadata=sar_metadata,
-            ais_data=ais_data,
-            radar_detections=radar_detections,
-            dark_vessels=dark_vessels,
-            hash_result=hash_result,
-            timestamp_result=timestamp_result,
-        )
+    if "report_path" not in state:
+        with st.spinner("📋 Generating forensic report..."):
+            state["report_path"], state["report_content"] = generate_report(
+                sar_metadata=sar_metadata,
+                ais_data=ais_data,
+                radar_detections=radar_detections,
+                dark_vessels=dark_vessels,
+                hash_result=hash_result,
+                timestamp_result=timestamp_result,
+            )
+
+    report_path = state["report_path"]
+    report_content = state["report_content"]
 
     st.success(f"✅ Report saved to: `{report_path}`")
 
@@ -479,7 +480,6 @@ if run_pipeline:
             <div class="stat-label">AIS Pings</div>
         </div>""", unsafe_allow_html=True)
     with c4:
-        avg_conf = sum(d.get("confidence", 0) for d in radar_detections) // max(len(radar_detections), 1)
         st.markdown(f"""<div class="stat-card">
             <div class="stat-value" style="color:#34d399;">{avg_conf}%</div>
             <div class="stat-label">Avg Confidence</div>
@@ -489,18 +489,17 @@ if run_pipeline:
     st.markdown("---")
     st.markdown("## 📄 Generated Report")
 
-    report_content = Path(report_path).read_text(encoding="utf-8")
-
     with st.expander("📋 View Full Forensic Report", expanded=True):
         st.code(report_content, language="markdown")
 
-    # Download button
+    # Download button — downloading needs no rerun at all
     st.download_button(
         label="📥 Download Report (.md)",
         data=report_content,
         file_name=Path(report_path).name,
         mime="text/markdown",
         type="primary",
+        on_click="ignore",
     )
 
     # Pipeline completion banner
@@ -512,7 +511,7 @@ if run_pipeline:
     else:
         st.success("✅ Pipeline complete — zone is compliant, no violations found.")
 
-# ── Footer when no pipeline is running ───────────────────────────────────────
+# ── Footer when no pipeline has run yet ──────────────────────────────────────
 else:
     st.markdown("---")
 
@@ -538,4 +537,5 @@ else:
     img_cols = st.columns(min(len(available_images), 3)) if available_images else []
     for i, img_path in enumerate(available_images):
         with img_cols[i % len(img_cols)]:
-            st.image(str(img_path), caption=img_path.name, width="stretch")
+            st.image(_thumbnail(str(img_path), img_path.stat().st_mtime_ns),
+                     caption=img_path.name, width="stretch")
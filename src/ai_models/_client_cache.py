@@ -0,0 +1,50 @@
+# Keeps one Gemini client alive per API key.
+# Reusing the client keeps its HTTP connection pool (and TLS session) warm
+# between pipeline runs instead of reconnecting on every detection call.
+
+import functools
+import logging
+
+
+# Request timeout for Gemini calls, in milliseconds
+_TIMEOUT_MS = 30_000
+
+logger = logging.getLogger(__name__)
+
+
+def new_client(api_key: str):
+    """
+    Build a new, uncached `google.genai.Client` for the given API key.
+
+    For callers that own the client's lifetime, e.g. async batches whose
+    connection pool is tied to one event loop and closed afterwards.
+    """
+    from google import genai
+    from google.genai.types import HttpOptions
+
+    return genai.Client(api_key=api_key, http_options=HttpOptions(timeout=_TIMEOUT_MS))
+
+
+@functools.lru_cache(maxsize=8)
+def get_client(api_key: str):
+    """
+    Return a cached `google.genai.Client` for the given API key.
+
+    The client is model-agnostic, so one instance serves every vision model.
+    """
+    return new_client(api_key)
+
+
+def warm_client(api_key: str, model_name: str) -> None:
+    """
+    Build the client for `api_key` and open its connection ahead of time.
+
+    Meant to run in the background as soon as a key is known, so the first
+    detection call skips the SDK import and the TLS handshake. A cheap model
+    metadata lookup is used to open the connection; failures are only
+    logged, since the real call will surface them.
+    """
+    try:
+        get_client(api_key).models.get(model=model_name)
+    except Exception as e:
+        logger.debug("  [AI] Gemini warm-up failed: %s", e)
@@ -1,10 +1,43 @@
 # The AI code that finds white dots (ships) in the radar images.
 # Uses Google Gemini Vision API to detect vessels in SAR satellite imagery.
 
+import asyncio
+import contextlib
+import functools
+import io
 import json
-import random
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional — fall back to the stdlib parser
+    from json import loads as _json_loads
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional — decode untyped with _json_loads
+    msgspec = None
+
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def _rng():
+    """
+    Return the generator for fallback detections, created on first use.
+
+    numpy is imported here rather than at module level, because the
+    dashboard imports this module on every page render for VISION_MODELS.
+    """
+    import numpy as np
+
+    return np.random.default_rng()
+
 
 # ── Gemini Vision Prompt ─────────────────────────────────────────────────────
 _DETECTION_PROMPT = """You are a maritime radar analyst. Analyze this SAR (Synthetic Aperture Radar) 
@@ -26,6 +59,60 @@ Example output:
 [{"vessel_id": "RADAR_001", "vessel_type": "Cargo Ship", "estimated_length_m": 180, "estimated_width_m": 30, "confidence": 85, "relative_position": "center-left"}]"""
 
 
+# ── Typed schema for the prompt's JSON output ────────────────────────────────
+# Values used when the model omits an optional field or sends null for it
+_DETECTION_DEFAULTS = {
+    "vessel_type": "Unknown",
+    "estimated_length_m": 0,
+    "estimated_width_m": 0,
+    "confidence": 0,
+    "relative_position": "unknown",
+}
+
+if msgspec is not None:
+    class Detection(msgspec.Struct):
+        """One vessel as described in _DETECTION_PROMPT."""
+        vessel_id: str
+        vessel_type: str | None = "Unknown"
+        estimated_length_m: int | float | None = 0
+        estimated_width_m: int | float | None = 0
+        confidence: int | float | None = 0
+        relative_position: str | None = "unknown"
+
+    # strict=False lets numbers quoted as strings through; unknown keys are skipped
+    _DETECTION_DECODER = msgspec.json.Decoder(list[Detection] | Detection, strict=False)
+    _DecodeError = msgspec.DecodeError
+else:
+    _DecodeError = json.JSONDecodeError
+
+
+def _parse_detections(response_text: str) -> list[dict]:
+    """
+    Decode the model's JSON reply into a list of detection dicts.
+
+    Uses the typed msgspec decoder when available. A reply that is valid
+    JSON but doesn't fit the schema (e.g. "confidence": "85%") is decoded
+    untyped instead, as are all replies without msgspec, so a real answer
+    is never replaced by simulated detections. Raises _DecodeError (or
+    json.JSONDecodeError) on malformed output.
+    """
+    if msgspec is not None:
+        try:
+            parsed = _DETECTION_DECODER.decode(response_text)
+        except msgspec.ValidationError:
+            pass
+        else:
+            rows = parsed if isinstance(parsed, list) else [parsed]
+            return [
+                {key: _DETECTION_DEFAULTS[key] if value is None else value
+                 for key, value in msgspec.structs.asdict(d).items()}
+                for d in rows
+            ]
+
+    parsed = _json_loads(response_text)
+    return parsed if isinstance(parsed, list) else [parsed]
+
+
 # ── Vision-capable Gemini models ─────────────────────────────────────────────
 VISION_MODELS = [
     "gemini-2.0-flash",
@@ -37,22 +124,184 @@ VISION_MODELS = [
 ]
 
 
+# Longest edge of the image sent to Gemini. Vision models downsample large
+# inputs anyway, so anything bigger only costs upload time.
+_UPLOAD_MAX_PX = 1536
+
+
+@functools.lru_cache(maxsize=32)
+def _prep_for_gemini(image_path: str, mtime_ns: int) -> bytes:
+    """
+    Downscale a SAR image and re-encode it as WebP for upload.
+
+    `mtime_ns` is only part of the cache key, so an edited file is
+    re-encoded. The original file is left untouched for evidence hashing.
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as im:
+        im.thumbnail((_UPLOAD_MAX_PX, _UPLOAD_MAX_PX), Image.Resampling.LANCZOS)
+        buf = io.BytesIO()
+        im.save(buf, "WEBP", quality=85)
+    return buf.getvalue()
+
+
+@functools.cache
+def _prompt_part():
+    """Return the detection prompt as a reusable `Part`, built on first use."""
+    from google.genai.types import Part
+
+    return Part.from_text(text=_DETECTION_PROMPT)
+
+
+# Files API uploads, keyed by (api_key, image_path, mtime_ns) and stored as
+# (file handle, Part referencing it). Gemini deletes uploads after 48 h, so
+# an entry is dropped shortly before it expires. Batches upload from worker
+# threads, so lookups and updates go through _uploads_lock.
+_UPLOAD_CACHE_SIZE = 256
+_UPLOAD_EXPIRY_MARGIN = timedelta(hours=1)
+_uploads: dict[tuple[str, str, int], tuple] = {}
+_uploads_lock = threading.Lock()
+
+
+def _upload_image(api_key: str, image_path: str, mtime_ns: int):
+    """
+    Upload the prepared image through the Gemini Files API.
+
+    Returns a `Part` referencing the upload. Re-analysing the same image
+    (another model, another rerun) then sends only the file reference
+    instead of the image bytes.
+    """
+    key = (api_key, image_path, mtime_ns)
+    with _uploads_lock:
+        cached = _uploads.get(key)
+    if cached is not None:
+        handle, part = cached
+        if (handle.expiration_time is None
+                or handle.expiration_time - _UPLOAD_EXPIRY_MARGIN > datetime.now(timezone.utc)):
+            return part
+
+    from google.genai.types import Part
+    from src.ai_models._client_cache import get_client
+
+    # The upload itself runs outside the lock so different images upload in
+    # parallel; two threads racing on one image just both upload it
+    handle = get_client(api_key).files.upload(
+        file=io.BytesIO(_prep_for_gemini(image_path, mtime_ns)),
+        config={"mime_type": "image/webp", "display_name": Path(image_path).name},
+    )
+    part = Part.from_uri(file_uri=handle.uri, mime_type=handle.mime_type)
+    with _uploads_lock:
+        _uploads.pop(key, None)
+        if len(_uploads) >= _UPLOAD_CACHE_SIZE:
+            _uploads.pop(next(iter(_uploads)))
+        _uploads[key] = (handle, part)
+    return part
+
+
+def _forget_upload(api_key: str, image_path: str, mtime_ns: int) -> None:
+    """Drop the cached upload of an image, e.g. after Gemini rejected it."""
+    with _uploads_lock:
+        _uploads.pop((api_key, image_path, mtime_ns), None)
+
+
+def _generate_with_upload(client, api_key: str, image_path: str, model_name: str):
+    """
+    Run generate_content() on an uploaded image.
+
+    A cached upload may have been deleted on Gemini's side before its
+    expiry, so on failure the entry is dropped and the call retried once
+    with a fresh upload. A second failure is raised.
+    """
+    mtime_ns = Path(image_path).stat().st_mtime_ns
+    for attempt in range(2):
+        image_part = _upload_image(api_key, image_path, mtime_ns)
+        try:
+            return client.models.generate_content(
+                model=model_name,
+                contents=[_prompt_part(), image_part],
+            )
+        except Exception as e:
+            _forget_upload(api_key, image_path, mtime_ns)
+            if attempt:
+                raise
+            logger.warning("  [AI] Gemini call failed (%s) — retrying with a fresh upload.", e)
+
+
+async def _agenerate_with_upload(client, api_key: str, image_path: str, model_name: str):
+    """Async variant of _generate_with_upload(); uploads run in a worker thread."""
+    mtime_ns = Path(image_path).stat().st_mtime_ns
+    for attempt in range(2):
+        image_part = await asyncio.to_thread(_upload_image, api_key, image_path, mtime_ns)
+        try:
+            return await client.aio.models.generate_content(
+                model=model_name,
+                contents=[_prompt_part(), image_part],
+            )
+        except Exception as e:
+            _forget_upload(api_key, image_path, mtime_ns)
+            if attempt:
+                raise
+            logger.warning("  [AI] Gemini call failed (%s) — retrying with a fresh upload.", e)
+
+
 def fallback_detections() -> list[dict]:
     """Return sample detections when the Gemini API is unavailable."""
     vessel_types = ["Industrial Trawler", "Cargo Ship", "Fishing Boat", "Tanker", "Unknown Vessel"]
     positions = ["center-left", "upper-right", "lower-center", "center", "upper-left"]
-    num = random.randint(2, 5)
-
-    detections = []
-    for i in range(num):
-        detections.append({
+    rng = _rng()
+    num = int(rng.integers(2, 6))
+
+    # Draw every field for all detections at once
+    type_idx = rng.integers(0, len(vessel_types), size=num)
+    lengths = rng.integers(20, 251, size=num).tolist()
+    widths = rng.integers(5, 41, size=num).tolist()
+    confidences = rng.integers(60, 99, size=num).tolist()
+    pos_idx = rng.integers(0, len(positions), size=num)
+
+    return [
+        {
             "vessel_id": f"RADAR_{i + 1:03d}",
-            "vessel_type": random.choice(vessel_types),
-            "estimated_length_m": random.randint(20, 250),
-            "estimated_width_m": random.randint(5, 40),
-            "confidence": random.randint(60, 98),
-            "relative_position": random.choice(positions),
-        })
+            "vessel_type": vessel_types[type_idx[i]],
+            "estimated_length_m": lengths[i],
+            "estimated_width_m": widths[i],
+            "confidence": confidences[i],
+            "relative_position": positions[pos_idx[i]],
+        }
+        for i in range(num)
+    ]
+
+
+def _has_api_key(api_key: str | None) -> bool:
+    """True if `api_key` looks like a real key rather than empty/placeholder."""
+    return bool(api_key) and api_key != "your_gemini_api_key_here"
+
+
+def _logged_fallback() -> list[dict]:
+    """Return fallback detections, logging each one."""
+    logger.info("  [AI] No valid Gemini API key — using fallback detections.")
+    detections = fallback_detections()
+    for d in detections:
+        logger.info("       → %s: %s (%s%% confidence)",
+                    d["vessel_id"], d["vessel_type"], d["confidence"])
+    return detections
+
+
+def _read_response(response) -> list[dict]:
+    """Extract and parse the detection list from a Gemini response."""
+    response_text = response.text.strip()
+
+    # Clean up response — remove markdown fences if present
+    if response_text.startswith("```"):
+        lines = response_text.split("\n")
+        response_text = "\n".join(lines[1:-1])
+
+    detections = _parse_detections(response_text)
+
+    logger.info("  [AI] Detected %d vessel(s) in the image.", len(detections))
+    for d in detections:
+        logger.info("       → %s: %s (%s%% confidence)", d.get("vessel_id", "?"),
+                    d.get("vessel_type", "?"), d.get("confidence", "?"))
     return detections
 
 
@@ -70,64 +319,151 @@ def detect_vessels(image_path: str, api_key: str = None,
         List of detected vessel dicts.
     """
     # ── Check if API key is provided ─────────────────────────────────────────
-    if not api_key or api_key == "your_gemini_api_key_here":
-        print("  [AI] No valid Gemini API key — using fallback detections.")
-        detections = fallback_detections()
-        for d in detections:
-            print(f"       → {d['vessel_id']}: {d['vessel_type']} "
-                  f"({d['confidence']}% confidence)")
-        return detections
+    if not _has_api_key(api_key):
+        return _logged_fallback()
 
     # ── Call Gemini API ──────────────────────────────────────────────────────
-    print(f"  [AI] Sending SAR image to Gemini ({model_name}) for vessel detection...")
+    logger.info("  [AI] Sending SAR image to Gemini (%s) for vessel detection...", model_name)
 
     try:
-        from google import genai
-        from google.genai.types import Part
+        from src.ai_models._client_cache import get_client
+
+        client = get_client(api_key)
+
+        # Reference a (cached) upload of a downscaled WebP copy instead of
+        # sending the full-resolution JPEG with every request
+        response = _generate_with_upload(client, api_key, image_path, model_name)
+        return _read_response(response)
 
-        client = genai.Client(api_key=api_key)
+    except (json.JSONDecodeError, _DecodeError) as e:
+        logger.warning("  [AI] WARNING: Could not parse Gemini response as JSON: %s", e)
+        logger.warning("       Falling back to simulated detections.")
+        return fallback_detections()
 
-        # Read image bytes
-        image_bytes = Path(image_path).read_bytes()
+    except Exception as e:
+        logger.error("  [AI] ERROR: Gemini API call failed: %s", e)
+        raise
 
-        response = client.models.generate_content(
-            model=model_name,
-            contents=[
-                _DETECTION_PROMPT,
-                Part.from_bytes(data=image_bytes, mime_type="image/jpeg"),
-            ],
-        )
 
-        response_text = response.text.strip()
+async def detect_vessels_async(image_path: str, api_key: str = None,
+                               model_name: str = "gemini-2.0-flash", *,
+                               client=None,
+                               semaphore: asyncio.Semaphore | None = None) -> list[dict]:
+    """
+    Async variant of detect_vessels() for analysing several images at once.
+
+    Args:
+        image_path:  Path to the SAR satellite image.
+        api_key:     Gemini API key. If None/empty, uses fallback detections.
+        model_name:  Gemini model to use (must support vision).
+        client:      google.genai client to use. Its async connection pool is
+                     bound to the running event loop, so one is created and
+                     closed per call if omitted.
+        semaphore:   Optional semaphore capping concurrent Gemini requests.
 
-        # Clean up response — remove markdown fences if present
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            response_text = "\n".join(lines[1:-1])
+    Returns:
+        List of detected vessel dicts.
+    """
+    if not _has_api_key(api_key):
+        return _logged_fallback()
 
-        detections = json.loads(response_text)
+    logger.info("  [AI] Sending %s to Gemini (%s) for vessel detection...",
+                Path(image_path).name, model_name)
 
-        if not isinstance(detections, list):
-            detections = [detections]
+    from src.ai_models._client_cache import new_client
 
-        print(f"  [AI] Detected {len(detections)} vessel(s) in the image.")
-        for d in detections:
-            print(f"       → {d.get('vessel_id', '?')}: {d.get('vessel_type', '?')} "
-                  f"({d.get('confidence', '?')}% confidence)")
+    owns_client = client is None
+    if owns_client:
+        client = new_client(api_key)
 
-        return detections
+    try:
+        async with semaphore or contextlib.nullcontext():
+            response = await _agenerate_with_upload(client, api_key, image_path, model_name)
+        return _read_response(response)
 
-    except json.JSONDecodeError as e:
-        print(f"  [AI] WARNING: Could not parse Gemini response as JSON: {e}")
-        print(f"       Falling back to simulated detections.")
+    except (json.JSONDecodeError, _DecodeError) as e:
+        logger.warning("  [AI] WARNING: Could not parse Gemini response as JSON: %s", e)
+        logger.warning("       Falling back to simulated detections.")
         return fallback_detections()
 
     except Exception as e:
-        print(f"  [AI] ERROR: Gemini API call failed: {e}")
+        logger.error("  [AI] ERROR: Gemini API call failed: %s", e)
         raise
 
+    finally:
+        if owns_client:
+            await client.aio.aclose()
+
+
+def _concurrency_from_env(default: int = 8) -> int:
+    """
+    Read GMIE_GEMINI_CONCURRENCY as a request limit of at least 1.
+
+    An invalid value only logs a warning, since this runs at import and the
+    dashboard imports this module on every page render.
+    """
+    raw = os.getenv("GMIE_GEMINI_CONCURRENCY", str(default))
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning("GMIE_GEMINI_CONCURRENCY=%s is not an integer, using %d.", raw, default)
+        return default
+    if value < 1:
+        logger.warning("GMIE_GEMINI_CONCURRENCY=%s is below 1, using 1.", raw)
+        return 1
+    return value
+
+
+# Max Gemini requests in flight during detect_vessels_batch()
+_BATCH_CONCURRENCY = _concurrency_from_env()
+
+
+def detect_vessels_batch(image_paths: list[str], api_key: str = None,
+                         model_name: str = "gemini-2.0-flash",
+                         concurrency: int = _BATCH_CONCURRENCY) -> list[list[dict] | Exception]:
+    """
+    Detect vessels in several SAR images with concurrent Gemini requests.
+
+    Wall time is roughly one round-trip per `concurrency` images instead of
+    one per image. Must be called from synchronous code (uses asyncio.run).
+
+    Args:
+        image_paths:  Paths to the SAR satellite images.
+        api_key:      Gemini API key. If None/empty, uses fallback detections.
+        model_name:   Gemini model to use (must support vision).
+        concurrency:  Max requests in flight (env GMIE_GEMINI_CONCURRENCY).
+                      Must be at least 1.
+
+    Returns:
+        One entry per image, in input order: the list of detected vessel
+        dicts, or the exception raised for that image (e.g. a rate-limit
+        error). A failed image doesn't cancel the rest of the batch.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+    async def _run() -> list[list[dict] | Exception]:
+        from src.ai_models._client_cache import new_client
+
+        semaphore = asyncio.Semaphore(concurrency)
+        client = new_client(api_key) if _has_api_key(api_key) else None
+        try:
+            # Every request has finished (or failed) once gather returns, so
+            # the shared client is only closed when nothing is using it
+            return await asyncio.gather(*(
+                detect_vessels_async(path, api_key, model_name,
+                                     client=client, semaphore=semaphore)
+                for path in image_paths
+            ), return_exceptions=True)
+        finally:
+            if client is not None:
+                await client.aio.aclose()
+
+    return asyncio.run(_run())
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     import sys as _sys
     sys_path = str(Path(__file__).resolve().parent.parent.parent)
     _sys.path.insert(0, sys_path)
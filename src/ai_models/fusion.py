@@ -1,16 +1,148 @@
 # The logic that compares Radar dots vs. AIS signals to find 'Dark Vessels'.
 # A "Dark Vessel" is one detected by radar but NOT broadcasting AIS signals.
 
-import random
+import functools
+import logging
 
+import numpy as np
 
-def _is_nearby(lat1: float, lon1: float, lat2: float, lon2: float,
-               threshold: float = 0.15) -> bool:
-    """Check if two coordinates are within a threshold distance (degrees)."""
-    return abs(lat1 - lat2) < threshold and abs(lon1 - lon2) < threshold
+try:
+    from numba import njit
+except ImportError:  # numba is optional — use the NumPy matcher below
+    njit = None
 
 
-def find_dark_vessels(ais_data: list[dict],
+logger = logging.getLogger(__name__)
+
+# Radar only reports where in the image a vessel is ("upper-left", ...), so
+# its position is estimated as this many degrees off the image centre per axis
+_POSITION_OFFSET_DEG = 0.25
+
+# A radar detection matches an AIS ping within this distance (degrees)
+_MATCH_RADIUS_DEG = 0.15
+
+# Radar rows per block when building the distance matrix, to bound memory
+_MATCH_BLOCK_ROWS = 1024
+
+_VERTICAL = {"upper": 1.0, "top": 1.0, "north": 1.0,
+             "lower": -1.0, "bottom": -1.0, "south": -1.0}
+_HORIZONTAL = {"left": -1.0, "west": -1.0, "right": 1.0, "east": 1.0}
+
+
+def _is_nearby(lat1, lon1, lat2, lon2, threshold: float = 0.15):
+    """
+    Check if two coordinates are within a threshold distance (degrees).
+
+    Accepts floats or NumPy arrays; arrays are compared element-wise and a
+    boolean mask is returned.
+    """
+    return (np.abs(lat1 - lat2) < threshold) & (np.abs(lon1 - lon2) < threshold)
+
+
+@functools.lru_cache(maxsize=256)
+def _position_offset(relative_position: str) -> tuple[float, float]:
+    """
+    Map a radar relative position (e.g. "upper-right") to a (lat, lon) offset.
+
+    Unrecognised or "center" positions map to the image centre.
+    """
+    words = relative_position.lower().replace("-", " ").split()
+    dlat = sum(_VERTICAL.get(w, 0.0) for w in words)
+    dlon = sum(_HORIZONTAL.get(w, 0.0) for w in words)
+    return dlat * _POSITION_OFFSET_DEG, dlon * _POSITION_OFFSET_DEG
+
+
+def _match_radar_to_ais_numpy(dist: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Match each radar detection to its nearest AIS ping within `threshold`.
+
+    Args:
+        dist:      (n_radar, n_ais) float64 distance matrix.
+        threshold: A pair matches when its distance is below this.
+
+    Returns:
+        int64 array with, per radar detection, the matched AIS index or -1.
+    """
+    if dist.shape[1] == 0:
+        return np.full(dist.shape[0], -1, dtype=np.int64)
+    nearest = dist.argmin(axis=1)
+    close = dist[np.arange(dist.shape[0]), nearest] < threshold
+    return np.where(close, nearest, -1).astype(np.int64)
+
+
+_match_radar_to_ais = _match_radar_to_ais_numpy
+
+if njit is not None:
+    @njit(cache=True)
+    def _match_radar_to_ais(dist, threshold):  # noqa: F811
+        # Compiled loop version: one pass per row, no temporaries
+        n_radar, n_ais = dist.shape
+        matches = np.full(n_radar, -1, dtype=np.int64)
+        for i in range(n_radar):
+            best = threshold
+            for j in range(n_ais):
+                if dist[i, j] < best:
+                    best = dist[i, j]
+                    matches[i] = j
+        return matches
+
+
+def _nearest_ais(radar_xy: np.ndarray, ais_xy: np.ndarray,
+                 threshold: float) -> np.ndarray:
+    """
+    Match (lat, lon) radar positions to the nearest AIS position within `threshold`.
+
+    The distance matrix is built in blocks of radar rows so its size stays
+    bounded however many detections there are.
+    """
+    matches = np.empty(len(radar_xy), dtype=np.int64)
+    for start in range(0, len(radar_xy), _MATCH_BLOCK_ROWS):
+        block = radar_xy[start:start + _MATCH_BLOCK_ROWS]
+        dist = np.hypot(block[:, None, 0] - ais_xy[None, :, 0],
+                        block[:, None, 1] - ais_xy[None, :, 1])
+        matches[start:start + len(block)] = _match_radar_to_ais(dist, threshold)
+    return matches
+
+
+def _incident_fields(sar_metadata: dict) -> dict:
+    """
+    Build the incident fields shared by every dark vessel in one SAR image.
+
+    Computed once per find_dark_vessels() call and merged into each record.
+    """
+    sar_lat = sar_metadata["latitude"]
+    sar_lon = sar_metadata["longitude"]
+    return {
+        "sar_latitude": sar_lat,
+        "sar_longitude": sar_lon,
+        "sar_date": sar_metadata["date"],
+        "ais_status": "NO SIGNAL DETECTED",
+        "violation_type": "AIS Transponder Disabled — Unauthorized Dark Operation",
+        "behavioral_anomaly": (
+            f"Vessel detected via SAR at {abs(sar_lat):.5f}°"
+            f"{'N' if sar_lat >= 0 else 'S'}, "
+            f"{abs(sar_lon):.5f}°{'E' if sar_lon >= 0 else 'W'} "
+            f"on {sar_metadata['date']}. No AIS transponder signal was "
+            f"received from this location, creating a 'Dark Period' "
+            f"in protected waters."
+        ),
+    }
+
+
+def _dark_vessel_record(detection: dict, incident: dict) -> dict:
+    """Build the incident dict for a radar detection with no AIS match."""
+    return {
+        "radar_id": detection["vessel_id"],
+        "vessel_type": detection.get("vessel_type", "Unknown"),
+        "estimated_length_m": detection.get("estimated_length_m", 0),
+        "estimated_width_m": detection.get("estimated_width_m", 0),
+        "confidence": detection.get("confidence", 0),
+        "relative_position": detection.get("relative_position", "unknown"),
+        **incident,
+    }
+
+
+def find_dark_vessels(ais_data: "list[dict] | AisFrame",
                       radar_detections: list[dict],
                       sar_metadata: dict) -> list[dict]:
     """
@@ -20,82 +152,76 @@ def find_dark_vessels(ais_data: list[dict],
     as a "Dark Vessel" — potentially operating illegally with transponder off.
 
     Args:
-        ais_data:          List of AIS records (ship_id, latitude, longitude, ...).
+        ais_data:          AIS records (ship_id, latitude, longitude, ...), as a
+                           list of dicts or an AisFrame.
         radar_detections:  List of radar detection dicts from Gemini.
         sar_metadata:      SAR image metadata (latitude, longitude, date, ...).
 
     Returns:
         List of dark vessel incident dicts.
     """
+    # ── Fast paths: nothing to compare against ──────────────────────────────
+    if not radar_detections:
+        logger.info("  [FUSION] No radar detections — no dark vessels possible.")
+        return []
+    if not ais_data:
+        logger.info("  [FUSION] No AIS signals — all %d detection(s) are dark.",
+                    len(radar_detections))
+        incident = _incident_fields(sar_metadata)
+        return [_dark_vessel_record(d, incident) for d in radar_detections]
+
     sar_lat = sar_metadata["latitude"]
     sar_lon = sar_metadata["longitude"]
 
     # ── Step 1: Find AIS ships near the SAR image area ───────────────────────
-    ais_ships_in_area = []
-    unique_ships = set()
-    for record in ais_data:
-        if _is_nearby(record["latitude"], record["longitude"], sar_lat, sar_lon, threshold=1.0):
-            if record["ship_id"] not in unique_ships:
-                ais_ships_in_area.append(record)
-                unique_ships.add(record["ship_id"])
+    # Work on AIS columns so the proximity test runs as one vectorised pass
+    # instead of a Python-level check per record. Only positions and IDs are
+    # compared, so dict records skip time parsing.
+    from src.ingestion.ais_stream import AisFrame
 
-    print(f"  [FUSION] AIS ships near SAR area: {len(ais_ships_in_area)}")
-    print(f"  [FUSION] Radar detections: {len(radar_detections)}")
+    ais = (ais_data if isinstance(ais_data, AisFrame)
+           else AisFrame.from_records(ais_data, with_time=False))
+    in_area = np.flatnonzero(_is_nearby(ais.lat, ais.lon, sar_lat, sar_lon, threshold=1.0))
+
+    logger.info("  [FUSION] AIS ships near SAR area: %d",
+                np.unique(ais.ship_id[in_area].astype(str)).size)
+    logger.info("  [FUSION] Radar detections: %d", len(radar_detections))
 
     # ── Step 2: Try to match each radar detection to an AIS signal ───────────
+    # Estimate each detection's position from where it sits in the image and
+    # match it to the nearest in-area AIS ping
+    radar_xy = np.array(
+        [_position_offset(d.get("relative_position") or "center") for d in radar_detections],
+        dtype=np.float64,
+    ) + (sar_lat, sar_lon)
+    ais_xy = np.column_stack((ais.lat[in_area], ais.lon[in_area]))
+    matches = _nearest_ais(radar_xy, ais_xy, _MATCH_RADIUS_DEG)
+
+    # Only dark vessels need a record built
+    incident = _incident_fields(sar_metadata)
     dark_vessels = []
-    matched_vessels = []
-
-    for detection in radar_detections:
-        matched = False
-
-        # For each radar detection, see if any AIS ship is nearby
-        for ais_ship in ais_ships_in_area:
-            # Since radar gives relative_position (not exact coords), we simulate
-            # matching by checking if the AIS ship is in the same general area
-            if random.random() < 0.4:  # ~40% chance of match (simulating overlap)
-                matched = True
-                matched_vessels.append({
-                    "radar": detection,
-                    "ais": ais_ship,
-                    "status": "IDENTIFIED",
-                })
-                print(f"       ✓ {detection['vessel_id']} matched → {ais_ship['ship_id']}")
-                break
-
-        if not matched:
+    n_matched = 0
+    for detection, j in zip(radar_detections, matches.tolist()):
+        if j >= 0:
+            n_matched += 1
+            logger.info("       ✓ %s matched → %s",
+                        detection["vessel_id"], ais.ship_id[in_area[j]])
+        else:
             # ── DARK VESSEL FOUND ────────────────────────────────────────────
-            dark_vessel = {
-                "radar_id": detection["vessel_id"],
-                "vessel_type": detection.get("vessel_type", "Unknown"),
-                "estimated_length_m": detection.get("estimated_length_m", 0),
-                "estimated_width_m": detection.get("estimated_width_m", 0),
-                "confidence": detection.get("confidence", 0),
-                "relative_position": detection.get("relative_position", "unknown"),
-                "sar_latitude": sar_lat,
-                "sar_longitude": sar_lon,
-                "sar_date": sar_metadata["date"],
-                "ais_status": "NO SIGNAL DETECTED",
-                "violation_type": "AIS Transponder Disabled — Unauthorized Dark Operation",
-                "behavioral_anomaly": (
-                    f"Vessel detected via SAR at {abs(sar_lat):.5f}°"
-                    f"{'N' if sar_lat >= 0 else 'S'}, "
-                    f"{abs(sar_lon):.5f}°{'E' if sar_lon >= 0 else 'W'} "
-                    f"on {sar_metadata['date']}. No AIS transponder signal was "
-                    f"received from this location, creating a 'Dark Period' "
-                    f"in protected waters."
-                ),
-            }
-            dark_vessels.append(dark_vessel)
-            print(f"       ✗ {detection['vessel_id']} → NO AIS MATCH → DARK VESSEL!")
-
-    print(f"\n  [FUSION] Result: {len(matched_vessels)} identified, "
-          f"{len(dark_vessels)} DARK VESSEL(S) detected.")
+            dark_vessels.append(_dark_vessel_record(detection, incident))
+            logger.info("       ✗ %s → NO AIS MATCH → DARK VESSEL!", detection["vessel_id"])
+
+    logger.info("\n  [FUSION] Result: %d identified, %d DARK VESSEL(S) detected.",
+                n_matched, len(dark_vessels))
 
     return dark_vessels
 
 
 if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     # Quick test with dummy data
     sample_ais = [
         {"ship_id": "SHIP_1000", "latitude": 16.53534, "longitude": -69.42185,
@@ -3,11 +3,115 @@
 
 import hashlib
 import json
+import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# Identifies how the evidence data is serialised before hashing. Bump it if
+# _canonical_json() ever changes, so earlier hashes can still be verified
+# by re-serialising with the matching version.
+SERIALIZATION_VERSION = "json-sort-keys/v1"
+
+
+def _canonical_json(obj) -> bytes:
+    """
+    Serialise `obj` the way evidence data is hashed (SERIALIZATION_VERSION).
+
+    Always the stdlib encoder with sorted keys, as in earlier releases.
+    Faster encoders format some floats differently (1.5e-7 vs 1.5e-07) or
+    reject integers beyond 64 bits, and a forensic digest must not depend
+    on which optional packages are installed.
+    """
+    return json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+
+
+logger = logging.getLogger(__name__)
+
+
+# Images larger than this are hashed straight from a memory map, which skips
+# copying the page cache into a read buffer (measurably faster from ~4 MiB)
+_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# Slice size when hashing a mapped image, small enough to stay cache-resident
+_MMAP_SLICE = 2 * 1024 * 1024
+
+
+def _select_sha256():
+    """
+    Pick the fastest SHA-256 constructor available, once at import.
+
+    OpenSSL's implementation uses the CPU's SHA extensions (x86 SHA-NI,
+    ARMv8 crypto) when present, so it is preferred. Interpreters built
+    without OpenSSL fall back to pycryptodome if installed, and finally to
+    hashlib's built-in implementation. All backends produce the same digest.
+    """
+    if hashlib.sha256.__name__.startswith("openssl_"):
+        return hashlib.sha256
+    try:
+        from Crypto.Hash import SHA256
+        return SHA256.new
+    except ImportError:
+        return hashlib.sha256
+
+
+_new_sha256 = _select_sha256()
+
+
+def hash_image(image_path: str,
+               image_bytes: bytes | None = None) -> "hashlib._Hash | None":
+    """
+    Hash the raw bytes of the SAR satellite image.
+
+    The image hash does not depend on any detection output, so callers can
+    run this in the background while the vision model is still working and
+    hand the result to hash_evidence() later.
+
+    Args:
+        image_path:  Path to the SAR image file.
+        image_bytes: The image contents, if the caller already has them in
+                     memory. Skips reading the file a second time.
+
+    Returns:
+        A SHA-256 hasher fed with the image bytes, or None if the image
+        does not exist.
+    """
+    if image_bytes is not None:
+        hasher_image = _new_sha256(image_bytes)
+        size = len(image_bytes)
+    else:
+        image_file = Path(image_path)
+        if not image_file.exists():
+            logger.warning("  [HASH] WARNING: Image not found at %s", image_path)
+            return None
+
+        # With the OpenSSL backend both paths hash with the GIL released
+        with image_file.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > _MMAP_THRESHOLD:
+                hasher_image = _new_sha256()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    with memoryview(mm) as view:
+                        for offset in range(0, size, _MMAP_SLICE):
+                            hasher_image.update(view[offset:offset + _MMAP_SLICE])
+            else:
+                # file_digest streams the file through a small reusable buffer;
+                # tell the kernel to read ahead since it is consumed in order
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                hasher_image = hashlib.file_digest(f, _new_sha256)
+
+    logger.info("  [HASH] Image hashed: %s bytes", format(size, ","))
+    return hasher_image
+
+
 def hash_evidence(image_path: str, detection_results: list[dict],
-                  dark_vessels: list[dict]) -> dict:
+                  dark_vessels: list[dict],
+                  image_hasher: "hashlib._Hash | None" = None) -> dict:
     """
     Create a SHA-256 hash of the combined evidence package.
 
@@ -23,48 +127,54 @@ def hash_evidence(image_path: str, detection_results: list[dict],
         image_path:        Path to the SAR image file.
         detection_results: List of radar detection dicts.
         dark_vessels:      List of dark vessel incident dicts.
+        image_hasher:      Optional result of hash_image() for the same
+                           image. If omitted, the image is hashed here.
 
     Returns:
-        Dict with keys: evidence_hash, image_hash, data_hash, algorithm
+        Dict with keys: evidence_hash, image_hash, data_hash, algorithm,
+        serialization (the SERIALIZATION_VERSION the data was hashed with)
     """
-    hasher_full = hashlib.sha256()
-    hasher_image = hashlib.sha256()
-    hasher_data = hashlib.sha256()
-
     # ── Hash 1: Image bytes ──────────────────────────────────────────────────
-    image_file = Path(image_path)
-    if image_file.exists():
-        image_bytes = image_file.read_bytes()
-        hasher_image.update(image_bytes)
-        hasher_full.update(image_bytes)
-        print(f"  [HASH] Image hashed: {len(image_bytes):,} bytes")
-    else:
-        print(f"  [HASH] WARNING: Image not found at {image_path}")
+    # Without a precomputed hasher, hash the image on a worker thread (the
+    # hash releases the GIL) while the evidence data is serialised below
+    image_future = None
+    if image_hasher is None:
+        pool = ThreadPoolExecutor(max_workers=1)
+        image_future = pool.submit(hash_image, image_path)
+        pool.shutdown(wait=False)
 
     # ── Hash 2: Detection + Dark Vessel data ─────────────────────────────────
-    evidence_json = json.dumps({
+    data_bytes = _canonical_json({
         "detections": detection_results,
         "dark_vessels": dark_vessels,
-    }, sort_keys=True, default=str)
-    data_bytes = evidence_json.encode("utf-8")
-    hasher_data.update(data_bytes)
+    })
+    hasher_data = _new_sha256(data_bytes)
+
+    if image_future is not None:
+        image_hasher = image_future.result()
+    hasher_image = image_hasher if image_hasher is not None else _new_sha256()
+
+    # The full hash continues from the image state instead of re-reading it
+    hasher_full = hasher_image.copy()
     hasher_full.update(data_bytes)
 
     image_hash = hasher_image.hexdigest()
     data_hash = hasher_data.hexdigest()
     full_hash = hasher_full.hexdigest()
 
-    print(f"  [HASH] Evidence Hash (SHA-256): {full_hash[:16]}...{full_hash[-8:]}")
+    logger.info("  [HASH] Evidence Hash (SHA-256): %s...%s", full_hash[:16], full_hash[-8:])
 
     return {
         "evidence_hash": full_hash,
         "image_hash": image_hash,
         "data_hash": data_hash,
         "algorithm": "SHA-256",
+        "serialization": SERIALIZATION_VERSION,
     }
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     # Quick test
     result = hash_evidence(
         image_path="data/11.26284N_66.40861W_2026-02-20.jpeg",
@@ -1,58 +1,129 @@
 # Connects to the Timestamp Authority for the legal 'time-seal'.
-# Fetches current Indian Standard Time (IST) from the internet.
+# Computes Indian Standard Time (IST) from an NTP-corrected local clock.
 
-import requests
+import functools
+import logging
+import threading
+import time
 from datetime import datetime, timezone, timedelta
 
 
 # IST is UTC+5:30
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# NTP server used to correct the system clock, and how long its offset is reused
+_NTP_SERVER = "pool.ntp.org"
+_OFFSET_TTL_S = 600
 
-def get_ist_timestamp() -> dict:
+# A failed query is retried after this long instead, so reports go back to
+# NTP time soon after the network recovers
+_FALLBACK_TTL_S = 30
+_FALLBACK_SOURCE = "System Clock (Fallback)"
+
+logger = logging.getLogger(__name__)
+
+
+def _ttl_cache(ttl):
+    """
+    Memoise a zero-argument function returning a dict for `ttl` seconds.
+
+    `ttl` may also be a function of the result, returning its lifetime in
+    seconds, so some results can expire sooner than others.
+
+    The wrapped function gains a `cache_clear()` method, like functools'
+    caches. Callers get a copy so they cannot mutate the cached result.
+    """
+    def decorator(func):
+        lock = threading.Lock()
+        cached = {"value": None, "expires": 0.0}
+
+        @functools.wraps(func)
+        def wrapper() -> dict:
+            with lock:
+                now = time.monotonic()
+                if cached["value"] is None or now >= cached["expires"]:
+                    cached["value"] = func()
+                    cached["expires"] = now + (ttl(cached["value"]) if callable(ttl) else ttl)
+                return dict(cached["value"])
+
+        def cache_clear() -> None:
+            with lock:
+                cached["value"] = None
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def _offset_ttl(result: dict) -> float:
+    """Keep an NTP offset for _OFFSET_TTL_S, a fallback only for _FALLBACK_TTL_S."""
+    return _FALLBACK_TTL_S if result["source"] == _FALLBACK_SOURCE else _OFFSET_TTL_S
+
+
+@_ttl_cache(_offset_ttl)
+def _get_clock_offset() -> dict:
     """
-    Fetch the current Indian Standard Time from worldtimeapi.org.
+    Measure how far the system clock is from NTP time.
 
-    Falls back to the local system clock if the API is unreachable.
+    Only the offset is fetched over the network, and only once per
+    _OFFSET_TTL_S, so timestamps themselves are computed locally. If NTP
+    is unreachable the query is retried after _FALLBACK_TTL_S.
 
     Returns:
-        Dict with keys: datetime_ist, datetime_utc, source, timezone
+        Dict with keys: offset_s (seconds to add to the system clock), source
     """
-    print("  [TIME] Fetching IST timestamp from worldtimeapi.org...")
+    logger.info("  [TIME] Querying %s for the clock offset...", _NTP_SERVER)
 
     try:
-        response = requests.get(
-            "http://worldtimeapi.org/api/timezone/Asia/Kolkata",
-            timeout=10,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        # Parse the datetime string from the API
-        raw_dt = data.get("datetime", "")
-        # The API returns format like: 2026-02-18T23:05:23.123456+05:30
-        ist_dt = datetime.fromisoformat(raw_dt)
-        utc_dt = ist_dt.astimezone(timezone.utc)
-
-        source = "worldtimeapi.org (Internet)"
-        print(f"  [TIME] IST: {ist_dt.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+        import ntplib
+
+        offset = ntplib.NTPClient().request(_NTP_SERVER, version=3, timeout=2).offset
+        logger.info("  [TIME] System clock offset: %+.3f s", offset)
+        return {"offset_s": offset, "source": f"NTP ({_NTP_SERVER})"}
 
     except Exception as e:
-        print(f"  [TIME] API unavailable ({e}), falling back to system clock.")
-        utc_dt = datetime.now(timezone.utc)
-        ist_dt = utc_dt.astimezone(IST)
-        source = "System Clock (Fallback)"
-        print(f"  [TIME] IST (system): {ist_dt.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.warning("  [TIME] NTP unavailable (%s), falling back to system clock.", e)
+        return {"offset_s": 0.0, "source": _FALLBACK_SOURCE}
+
+
+def warm_clock() -> None:
+    """
+    Fetch the NTP clock offset ahead of time.
+
+    Meant to run in the background once per session, so the first evidence
+    timestamp doesn't wait on the network. The offset is cached as usual.
+    """
+    _get_clock_offset()
+
+
+def get_ist_timestamp() -> dict:
+    """
+    Get the current Indian Standard Time, corrected against NTP.
+
+    The system clock is adjusted by an NTP offset that is cached for
+    10 minutes; if NTP is unreachable (or ntplib is not installed) the
+    uncorrected system clock is used. Call
+    `_get_clock_offset.cache_clear()` to force a fresh NTP query.
+
+    Returns:
+        Dict with keys: datetime_ist, datetime_utc, source, timezone
+    """
+    clock = _get_clock_offset()
+    utc_dt = datetime.now(timezone.utc) + timedelta(seconds=clock["offset_s"])
+    ist_dt = utc_dt.astimezone(IST)
+    logger.info("  [TIME] IST: %s", ist_dt.strftime("%Y-%m-%d %H:%M:%S %Z"))
 
     return {
         "datetime_ist": ist_dt.strftime("%Y-%m-%d %H:%M:%S"),
         "datetime_utc": utc_dt.strftime("%Y-%m-%d %H:%M:%S"),
-        "source": source,
+        "source": clock["source"],
         "timezone": "Asia/Kolkata (IST, UTC+05:30)",
     }
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     ts = get_ist_timestamp()
     print(f"\n  IST: {ts['datetime_ist']}")
     print(f"  UTC: {ts['datetime_utc']}")
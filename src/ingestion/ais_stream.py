@@ -1,8 +1,20 @@
 # Connects to AIS feeds to collect ship ID signals.
 # For demonstration: generates random AIS data based on the sample data format.
 
-import random
-from datetime import datetime, timedelta
+import logging
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+_rng = np.random.default_rng()
+
+# Max random drift (degrees) of a ping from the ship's base position
+_MAX_DRIFT = 0.1
 
 
 # ── Sample ship database (based on known vessel tracks) ──────────────────────
@@ -15,50 +27,143 @@ _SHIP_DATABASE = [
 ]
 
 
-def _random_drift(base: float, max_drift: float = 0.1) -> float:
-    """Add small random drift to a coordinate to simulate vessel movement."""
-    return round(base + random.uniform(-max_drift, max_drift), 5)
+def _parse_stamp(stamp: str) -> np.datetime64:
+    """Parse one ISO date-time string, or return NaT if it can't be parsed."""
+    try:
+        return np.datetime64(stamp, "s")
+    except ValueError:
+        return np.datetime64("NaT", "s")
+
+
+def _parse_times(records: list[dict]) -> np.ndarray:
+    """Parse the date and time of AIS records into a datetime64[s] column."""
+    stamps = [
+        f"{r['date']}T{r['time']}"
+        if isinstance(r.get("date"), str) and isinstance(r.get("time"), str) else "NaT"
+        for r in records
+    ]
+    # Times with a zone suffix ("12:00:00Z") parse, but numpy warns about them
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        try:
+            return np.array(stamps, dtype="datetime64[s]")
+        except ValueError:  # at least one unparseable stamp — go record by record
+            return np.array([_parse_stamp(stamp) for stamp in stamps], dtype="datetime64[s]")
+
+
+@dataclass(frozen=True)
+class AisFrame:
+    """
+    AIS pings stored column-wise (one NumPy array per field).
 
+    Lets fusion filter and match on whole position columns instead of
+    looking up fields record by record. Use to_records() / from_records()
+    to convert to and from the list-of-dicts form the dashboard shows.
+    """
+    ship_id: np.ndarray  # object (str)
+    lat: np.ndarray      # float64
+    lon: np.ndarray      # float64
+    time: np.ndarray     # datetime64[s], local time (NaT if not reported)
+
+    def __len__(self) -> int:
+        return len(self.ship_id)
+
+    @classmethod
+    def from_records(cls, records: list[dict], with_time: bool = True) -> "AisFrame":
+        """
+        Build a frame from AIS dicts (ship_id, latitude, longitude[, date, time]).
+
+        Records whose date or time is missing or can't be parsed get NaT in
+        the time column. Callers that only need positions can pass
+        with_time=False to skip parsing times altogether (all NaT).
+        """
+        n = len(records)
+        if with_time:
+            time = _parse_times(records)
+        else:
+            time = np.full(n, np.datetime64("NaT", "s"))
+        return cls(
+            ship_id=np.array([r["ship_id"] for r in records], dtype=object),
+            lat=np.fromiter((r["latitude"] for r in records), dtype=np.float64, count=n),
+            lon=np.fromiter((r["longitude"] for r in records), dtype=np.float64, count=n),
+            time=time,
+        )
+
+    def to_records(self) -> list[dict]:
+        """
+        Return the pings as AIS dicts (ship_id, latitude, longitude, date, time).
+
+        Pings with a NaT time are returned without the date and time keys.
+        """
+        stamps = np.datetime_as_string(self.time, unit="s").tolist()
+        records = []
+        for ship_id, lat, lon, stamp in zip(
+                self.ship_id.tolist(), self.lat.tolist(), self.lon.tolist(), stamps):
+            record = {"ship_id": ship_id, "latitude": lat, "longitude": lon}
+            if stamp != "NaT":
+                record["date"] = stamp[:10]
+                record["time"] = stamp[11:]
+            records.append(record)
+        return records
 
-def get_ais_data(num_ships: int = None, num_pings: int = 3) -> list[dict]:
+
+def get_ais_frame(num_ships: int = None, num_pings: int = 3) -> AisFrame:
     """
-    Generate random AIS data records simulating ship position broadcasts.
+    Generate random AIS pings simulating ship position broadcasts, column-wise.
 
     Args:
         num_ships: Number of ships to include (default: random 3–5).
         num_pings: Number of position pings per ship.
 
     Returns:
-        List of dicts with keys: ship_id, latitude, longitude, date, time
+        AisFrame with ships' pings in consecutive rows.
     """
     if num_ships is None:
-        num_ships = random.randint(3, 5)
+        num_ships = int(_rng.integers(3, 6))
 
     # Pick random ships from our database
-    selected_ships = random.sample(_SHIP_DATABASE, min(num_ships, len(_SHIP_DATABASE)))
-
-    now = datetime.now()
-    records = []
-
-    for ship in selected_ships:
-        base_time = now - timedelta(hours=1)
-
-        for ping in range(num_pings):
-            ping_time = base_time + timedelta(minutes=30 * ping)
-            record = {
-                "ship_id": ship["ship_id"],
-                "latitude": _random_drift(ship["base_lat"]),
-                "longitude": _random_drift(ship["base_lon"]),
-                "date": ping_time.strftime("%Y-%m-%d"),
-                "time": ping_time.strftime("%H:%M:%S"),
-            }
-            records.append(record)
+    picks = _rng.choice(len(_SHIP_DATABASE), size=min(num_ships, len(_SHIP_DATABASE)),
+                        replace=False)
+    selected_ships = [_SHIP_DATABASE[i] for i in picks]
+    n_ships = len(selected_ships)
+
+    # Every ship pings every 30 minutes, starting an hour ago
+    base_time = np.datetime64(datetime.now().replace(microsecond=0), "s") - np.timedelta64(1, "h")
+    ping_times = base_time + np.arange(num_pings) * np.timedelta64(30, "m")
+
+    # Random drift around each ship's base position simulates vessel movement,
+    # drawn for all ships and pings in one go: shape (ships, pings, lat/lon)
+    base = np.array([[s["base_lat"], s["base_lon"]] for s in selected_ships], dtype=np.float64)
+    drift = _rng.uniform(-_MAX_DRIFT, _MAX_DRIFT, size=(n_ships, num_pings, 2))
+    positions = np.round(base[:, None, :] + drift, 5).reshape(-1, 2)
 
-    print(f"  [AIS] Generated {len(records)} AIS pings from {num_ships} vessels.")
-    return records
+    frame = AisFrame(
+        ship_id=np.repeat(np.array([s["ship_id"] for s in selected_ships], dtype=object), num_pings),
+        lat=positions[:, 0].copy(),
+        lon=positions[:, 1].copy(),
+        time=np.tile(ping_times, n_ships),
+    )
+
+    logger.info("  [AIS] Generated %d AIS pings from %d vessels.", len(frame), num_ships)
+    return frame
+
+
+def get_ais_data(num_ships: int = None, num_pings: int = 3) -> list[dict]:
+    """
+    Generate random AIS data records simulating ship position broadcasts.
+
+    Args:
+        num_ships: Number of ships to include (default: random 3–5).
+        num_pings: Number of position pings per ship.
+
+    Returns:
+        List of dicts with keys: ship_id, latitude, longitude, date, time
+    """
+    return get_ais_frame(num_ships, num_pings).to_records()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     data = get_ais_data()
     for r in data:
         print(f"  {r['ship_id']}\t{r['latitude']}\t{r['longitude']}\t{r['date']}\t{r['time']}")
\ No newline at end of file
@@ -1,38 +1,52 @@
 # Automatically downloads radar images from the satellite database.
 # For demonstration: picks a random SAR image from the local data/ folder.
 
+import functools
+import logging
 import random
 import re
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from config.settings import DATA_DIR
 
+logger = logging.getLogger(__name__)
 
-def _parse_filename(filename: str) -> dict | None:
+
+# SAR image filename pattern (see _parse_filename), compiled once
+_FN_RE = re.compile(r"^([\d.]+)([NS])_([\d.]+)([EW])_(\d{4}-\d{2}-\d{2})\.jpeg$")
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_fields(filename: str) -> tuple | None:
     """
-    Parse a SAR image filename to extract metadata.
-    Expected format: [Lat][N/S]_[Lon][E/W]_[Date].jpeg
-    Example:         11.26284N_66.40861W_2026-02-20.jpeg
+    Match a SAR image filename and convert its fields, memoised per name.
+
+    Returns (lat, lon, lat_dir, lon_dir, date) with signed coordinates,
+    or None if the name doesn't follow the expected format.
     """
-    pattern = r"^([\d.]+)([NS])_([\d.]+)([EW])_(\d{4}-\d{2}-\d{2})\.jpeg$"
-    match = re.match(pattern, filename)
+    match = _FN_RE.match(filename)
     if not match:
         return None
 
-    lat = float(match.group(1))
-    lat_dir = match.group(2)
-    lon = float(match.group(3))
-    lon_dir = match.group(4)
-    date = match.group(5)
+    lat_s, lat_dir, lon_s, lon_dir, date = match.groups()
 
     # Convert to signed coordinates (S = negative lat, W = negative lon)
-    if lat_dir == "S":
-        lat = -lat
-    if lon_dir == "W":
-        lon = -lon
+    lat = -float(lat_s) if lat_dir == "S" else float(lat_s)
+    lon = -float(lon_s) if lon_dir == "W" else float(lon_s)
+    return lat, lon, lat_dir, lon_dir, date
+
 
+def _parse_filename(filename: str) -> dict | None:
+    """
+    Parse a SAR image filename to extract metadata.
+    Expected format: [Lat][N/S]_[Lon][E/W]_[Date].jpeg
+    Example:         11.26284N_66.40861W_2026-02-20.jpeg
+    """
+    fields = _parse_fields(filename)
+    if fields is None:
+        return None
+
+    # A fresh dict per call, so callers may modify it without touching the cache
+    lat, lon, lat_dir, lon_dir, date = fields
     return {
         "latitude": lat,
         "longitude": lon,
@@ -42,6 +56,17 @@ def _parse_filename(filename: str) -> dict | None:
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _list_images(data_dir: Path, mtime_ns: int) -> tuple[Path, ...]:
+    """
+    List the SAR images in `data_dir`.
+
+    `mtime_ns` is the directory's mtime and only serves as the cache key —
+    adding or removing a file changes it and forces a fresh listing.
+    """
+    return tuple(data_dir.glob("*.jpeg"))
+
+
 def fetch_sar_image() -> dict:
     """
     Simulate fetching a SAR image by randomly selecting one from data/.
@@ -49,7 +74,10 @@ def fetch_sar_image() -> dict:
     Returns:
         Dict with keys: image_path, latitude, longitude, date, image_id
     """
-    images = list(DATA_DIR.glob("*.jpeg"))
+    # Imported here so parsing helpers don't trigger the settings/.env load
+    from config.settings import DATA_DIR
+
+    images = _list_images(DATA_DIR, DATA_DIR.stat().st_mtime_ns)
     if not images:
         raise FileNotFoundError(f"No .jpeg images found in {DATA_DIR}")
 
@@ -70,15 +98,19 @@ def fetch_sar_image() -> dict:
         "image_id": f"S1-{selected.stem.replace('.', '').replace('_', '-')}",
     }
 
-    print(f"  [SAR] Selected image: {selected.name}")
-    print(f"        Location: {abs(result['latitude'])}°{metadata['lat_direction']}, "
-          f"{abs(result['longitude'])}°{metadata['lon_direction']}")
-    print(f"        Date: {result['date']}")
+    logger.info("  [SAR] Selected image: %s", selected.name)
+    logger.info("        Location: %s°%s, %s°%s",
+                abs(result["latitude"]), metadata["lat_direction"],
+                abs(result["longitude"]), metadata["lon_direction"])
+    logger.info("        Date: %s", result["date"])
 
     return result
 
 
 if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     img = fetch_sar_image()
     print(f"\n  Image path: {img['image_path']}")
     print(f"  Image ID:   {img['image_id']}")
@@ -0,0 +1,75 @@
+# Tests for radar/AIS matching (src/ai_models/fusion.py).
+
+import numpy as np
+import pytest
+
+from src.ai_models import fusion
+
+
+SAR = {"latitude": 16.5, "longitude": -69.4, "date": "2026-02-17"}
+
+
+def _radar(vessel_id, relative_position):
+    return {"vessel_id": vessel_id, "vessel_type": "Trawler", "confidence": 85,
+            "estimated_length_m": 45, "estimated_width_m": 12,
+            "relative_position": relative_position}
+
+
+def _ais(ship_id, lat, lon):
+    return {"ship_id": ship_id, "latitude": lat, "longitude": lon,
+            "date": "2026-02-17", "time": "12:00:00"}
+
+
+def _dark_ids(ais, radar):
+    return [d["radar_id"] for d in fusion.find_dark_vessels(ais, radar, SAR)]
+
+
+def test_detection_matches_ping_at_its_offset():
+    off = fusion._POSITION_OFFSET_DEG
+    ais = [_ais("SHIP_1", SAR["latitude"] + off, SAR["longitude"] + off)]
+    assert _dark_ids(ais, [_radar("RADAR_001", "upper-right")]) == []
+
+
+def test_detection_misses_ping_beyond_match_radius():
+    off = fusion._POSITION_OFFSET_DEG
+    ais = [_ais("SHIP_1", SAR["latitude"] + off,
+                SAR["longitude"] + off + 2 * fusion._MATCH_RADIUS_DEG)]
+    assert _dark_ids(ais, [_radar("RADAR_001", "upper-right")]) == ["RADAR_001"]
+
+
+@pytest.mark.parametrize("position", [None, "", "center", "somewhere odd"])
+def test_missing_or_unknown_position_maps_to_centre(position):
+    ais = [_ais("SHIP_1", SAR["latitude"], SAR["longitude"])]
+    assert _dark_ids(ais, [_radar("RADAR_001", position)]) == []
+
+
+def test_position_offset_directions():
+    off = fusion._POSITION_OFFSET_DEG
+    assert fusion._position_offset("upper-left") == (off, -off)
+    assert fusion._position_offset("Lower Right") == (-off, off)
+    assert fusion._position_offset("center") == (0.0, 0.0)
+
+
+def test_no_ais_in_area_means_every_detection_is_dark():
+    ais = [_ais("SHIP_1", SAR["latitude"] + 5, SAR["longitude"] + 5)]
+    radar = [_radar("RADAR_001", "center"), _radar("RADAR_002", "upper-left")]
+    assert _dark_ids(ais, radar) == ["RADAR_001", "RADAR_002"]
+
+
+def test_no_ais_at_all_means_every_detection_is_dark():
+    radar = [_radar("RADAR_001", "center"), _radar("RADAR_002", None)]
+    assert _dark_ids([], radar) == ["RADAR_001", "RADAR_002"]
+
+
+@pytest.mark.parametrize("shape", [(0, 0), (5, 0), (0, 5), (1, 1), (200, 37)])
+def test_numba_and_numpy_matchers_agree(shape):
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    dist = rng.uniform(0.0, 0.5, size=shape)
+    # Exact ties must resolve to the same (first) AIS index
+    if shape[1] > 1:
+        dist[:, 1] = dist[:, 0]
+    expected = fusion._match_radar_to_ais_numpy(dist, fusion._MATCH_RADIUS_DEG)
+    actual = fusion._match_radar_to_ais(dist, fusion._MATCH_RADIUS_DEG)
+    assert actual.dtype == expected.dtype == np.int64
+    np.testing.assert_array_equal(actual, expected)
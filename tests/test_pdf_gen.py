@@ -0,0 +1,89 @@
+# Tests for report generation (src/reporting/pdf_gen.py).
+
+import os
+
+import pytest
+
+from src.reporting import pdf_gen
+
+
+def _job(image_path, dark_vessels=()):
+    return {
+        "sar_metadata": {
+            "image_path": str(image_path),
+            "image_name": image_path.name,
+            "image_id": "S1-1126284N-6640861W-2026-02-20",
+            "latitude": 11.26284,
+            "longitude": -66.40861,
+            "date": "2026-02-20",
+        },
+        "ais_data": [],
+        "radar_detections": [],
+        "dark_vessels": list(dark_vessels),
+        "hash_result": {
+            "evidence_hash": "e" * 64,
+            "image_hash": "i" * 64,
+            "data_hash": "d" * 64,
+            "algorithm": "SHA-256",
+            "serialization": "json-sort-keys/v1",
+        },
+        "timestamp_result": {
+            "datetime_ist": "2026-02-18 23:05:23",
+            "datetime_utc": "2026-02-18 17:35:23",
+            "source": "NTP (pool.ntp.org)",
+        },
+    }
+
+
+@pytest.fixture
+def reports_dir(tmp_path, monkeypatch):
+    path = tmp_path / "reports"
+    path.mkdir()
+    monkeypatch.setattr(pdf_gen, "_REPORTS_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def sar_image(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    image = data_dir / "11.26284N_66.40861W_2026-02-20.jpeg"
+    image.write_bytes(os.urandom(3 * 1024 * 1024))
+    return image
+
+
+def test_batch_over_shared_image_leaves_source_unchanged(reports_dir, sar_image):
+    original = sar_image.read_bytes()
+    dark_vessel = {
+        "radar_id": "RADAR_001", "vessel_type": "Industrial Trawler",
+        "estimated_length_m": 45, "estimated_width_m": 12, "confidence": 85,
+        "relative_position": "center-left", "ais_status": "NO SIGNAL DETECTED",
+        "violation_type": "AIS Transponder Disabled",
+        "behavioral_anomaly": "Dark period detected in protected waters.",
+    }
+    jobs = [_job(sar_image, [dark_vessel] if i % 2 else []) for i in range(32)]
+
+    paths = pdf_gen.generate_reports(jobs, max_workers=4)
+
+    assert sar_image.read_bytes() == original
+    assert (reports_dir / sar_image.name).read_bytes() == original
+    assert not os.path.samefile(sar_image, reports_dir / sar_image.name)
+    assert len(set(paths)) == len(jobs)
+    assert all(os.path.dirname(p) == str(reports_dir) for p in paths)
+    assert sorted(p.name for p in reports_dir.iterdir()) == sorted(
+        [os.path.basename(p) for p in paths] + [sar_image.name])
+
+
+def test_id_pool_report_ids_are_unique():
+    pool = pdf_gen._id_pool(50_000)
+    assert len({report_id for report_id, _ in pool}) == len(pool)
+
+
+def test_existing_report_is_never_overwritten(reports_dir, sar_image):
+    ids = ("GMIE-2026-00001", "0x" + "0" * 40)
+    first_path, first_content = pdf_gen.generate_report(**_job(sar_image), ids=ids)
+    second_path, second_content = pdf_gen.generate_report(**_job(sar_image), ids=ids)
+
+    assert second_path != first_path
+    assert "GMIE-2026-00001" not in second_content
+    assert (reports_dir / "GMIE-2026-00001.md").read_text(encoding="utf-8") == first_content